@@ -0,0 +1,66 @@
+"""
+API Middleware
+
+Request-level guards that run before any route or form parsing.
+"""
+
+from fastapi import HTTPException
+from fastapi.responses import ORJSONResponse
+import sys
+sys.path.append('..')
+
+from config import MAX_UPLOAD_BYTES
+
+# Room for multipart boundaries and the small form fields sent alongside the image
+FORM_OVERHEAD_BYTES = 64 * 1024
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Reject request bodies larger than MAX_UPLOAD_BYTES with 413.
+
+    Pure ASGI middleware: a declared Content-Length above the limit is
+    rejected before the body is read, and bodies without one (chunked
+    uploads) are counted while streaming and aborted as soon as they
+    cross the limit, so an oversized upload is never fully buffered.
+    """
+
+    def __init__(self, app, max_bytes: int = None):
+        self.app = app
+        self.max_bytes = (max_bytes or MAX_UPLOAD_BYTES) + FORM_OVERHEAD_BYTES
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length is not None:
+            try:
+                declared = int(content_length)
+            except ValueError:
+                await self._reject(scope, receive, send, 400, "Invalid Content-Length header")
+                return
+            if declared > self.max_bytes:
+                await self._reject(scope, receive, send, 413, self._too_large_detail(declared))
+                return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    raise HTTPException(status_code=413, detail=self._too_large_detail(received))
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+    def _too_large_detail(self, size: int) -> str:
+        return f"Request body too large ({size} bytes, max {self.max_bytes})"
+
+    async def _reject(self, scope, receive, send, status_code: int, detail: str):
+        response = ORJSONResponse({"detail": detail}, status_code=status_code)
+        await response(scope, receive, send)
@@ -8,14 +8,22 @@ FastAPI endpoints for:
 - Face database management
 """
 from fastapi import APIRouter, File, UploadFile, Form, HTTPException, Query
-from fastapi.responses import JSONResponse
-from typing import Optional, List
+from fastapi.responses import ORJSONResponse
+from typing import Optional, List, Dict, Tuple
+import asyncio
+import time
 import numpy as np
 
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+
 from .schemas import (
-    DetectFaceResponse, FaceDetection,
-    RecognizeFaceResponse, RecognitionMatch,
+    DetectFaceResponse, RecognizeFaceResponse,
     AddFaceResponse, GetFaceResponse, UpdateFaceResponse, DeleteFaceResponse,
+    FaceRecordPublic, FaceRecordFull,
     HealthResponse, MobileCheckinResponse,
     FASCheckinResponse, FASCheckinStep,
     ConfigUpdate, ConfigResponse
@@ -26,7 +34,9 @@ from models.face_recognizer import get_face_recognizer
 from models.anti_spoofing import get_fas_predictor
 
 from models.database import get_face_database
-from utils.image_utils import load_image_from_bytes
+from services.embedding_batcher import get_embedding_batcher
+from utils.image_utils import load_image_from_file
+from utils.concurrency import run_cpu_bound
 from utils.geo_utils import calculate_distance
 import config
 from datetime import datetime
@@ -35,43 +45,329 @@ from utils.config_utils import update_config_value, load_dynamic_config
 
 router = APIRouter()
 
+def _check_upload_size(file: UploadFile):
+    """Reject uploads larger than MAX_UPLOAD_BYTES before any decode work"""
+    if file.size is not None and file.size > config.MAX_UPLOAD_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Image too large ({file.size} bytes, max {config.MAX_UPLOAD_BYTES})"
+        )
+
 
-@router.get("/health", response_model=HealthResponse)
-async def health_check():
+def _l2_normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize each row of a (F, D) float32 matrix in place"""
+    vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-8)
+    return vectors
+
+
+class _EmbeddingCache:
     """
-    Health check endpoint
+    In-memory index of L2-normalized database embeddings.
+    
+    Built lazily from the face database and invalidated whenever faces
+    are updated or deleted, so recognition is a single inner-product search
+    instead of a per-row Python comparison. Uses a FAISS IndexFlatIP when
+    faiss is installed, otherwise a plain numpy matmul. Display names are
+    cached alongside so matches need no per-face database lookup.
+    
+    Rebuilds create a new instance on CPU_POOL that replaces the module-level
+    cache in one assignment, so handlers never see a half-built index.
     """
-    db = get_face_database()
     
-    # Check model availability
+    def __init__(self):
+        self.matrix: Optional[np.ndarray] = None  # (N, 512) float32, unit rows
+        self.user_ids: List[str] = []
+        self.names: Dict[str, Optional[str]] = {}
+        self.index = None
+        self.loaded_at: float = 0.0
+    
+    @property
+    def is_loaded(self) -> bool:
+        return self.matrix is not None
+    
+    @property
+    def is_stale(self) -> bool:
+        """True once the cache is older than FR_CACHE_TTL_SECONDS (other workers may have written)"""
+        if config.FR_CACHE_TTL_SECONDS <= 0:
+            return False
+        return time.monotonic() - self.loaded_at > config.FR_CACHE_TTL_SECONDS
+    
+    @classmethod
+    def build(cls, db) -> "_EmbeddingCache":
+        """Create a fully loaded cache (blocking; run it on CPU_POOL)"""
+        return cls().load(db)
+    
+    def load(self, db) -> "_EmbeddingCache":
+        """Rebuild the normalized matrix (and FAISS index) from the database"""
+        user_ids, names, matrix = db.get_embedding_matrix()
+        
+        # frombuffer gives a read-only view, so normalize a writable copy once;
+        # every search below relies on these rows being unit length
+        matrix = _l2_normalize(matrix.copy())
+        
+        index = None
+        if FAISS_AVAILABLE:
+            index = faiss.IndexFlatIP(matrix.shape[1])
+            index.add(matrix)
+        
+        self.user_ids = user_ids
+        self.names = dict(zip(user_ids, names))
+        self.index = index
+        self.matrix = matrix
+        self.loaded_at = time.monotonic()
+        return self
+    
+    def add(self, user_id: str, embedding: np.ndarray, name: Optional[str] = None):
+        """Append a newly registered face without a full reload"""
+        if not self.is_loaded:
+            return
+        
+        vector = _l2_normalize(np.array(embedding, dtype=np.float32).reshape(1, -1))
+        
+        if self.index is not None:
+            self.index.add(vector)
+        self.matrix = np.vstack([self.matrix, vector])
+        self.user_ids.append(user_id)
+        self.names[user_id] = name
+    
+    def search(self, queries: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the best database match for each normalized query embedding
+        
+        Args:
+            queries: (F, 512) float32 matrix of unit-length embeddings
+        
+        Returns:
+            Tuple of (similarities, row indices), each of shape (F,)
+        """
+        if self.index is not None:
+            sims, idx = self.index.search(queries, 1)
+            return sims[:, 0], idx[:, 0]
+        
+        sims = queries @ self.matrix.T
+        idx = np.argpartition(-sims, 0, axis=1)[:, 0]
+        return sims[np.arange(len(queries)), idx], idx
+    
+    def similarities(self, embedding: np.ndarray) -> np.ndarray:
+        """Cosine similarity of one embedding against every cached face, shape (N,)"""
+        query = _l2_normalize(np.array(embedding, dtype=np.float32).reshape(1, -1))
+        return (query @ self.matrix.T)[0]
+    
+    def best_match(self, embedding: np.ndarray, threshold: float) -> Optional[Dict]:
+        """
+        Find the best database match for a single embedding
+        
+        Returns:
+            Dict with 'user_id', 'similarity', 'is_match' (same shape as
+            FaceRecognizer.recognize) or None if the cache is empty
+        """
+        if not self.user_ids:
+            return None
+        
+        query = _l2_normalize(np.array(embedding, dtype=np.float32).reshape(1, -1))
+        sims, idx = self.search(query)
+        similarity = float(sims[0])
+        
+        return {
+            'user_id': self.user_ids[idx[0]],
+            'similarity': similarity,
+            'is_match': similarity >= threshold
+        }
+
+
+
+_embedding_cache = _EmbeddingCache()
+
+# Bumped by every local write; a rebuild that raced with one is not swapped in
+_cache_generation = 0
+_cache_refresh: Optional[asyncio.Task] = None
+
+
+def _add_to_embedding_cache(user_id: str, embedding: np.ndarray, name: Optional[str]):
+    """Append a newly registered face to the live cache"""
+    global _cache_generation
+    _embedding_cache.add(user_id, embedding, name)
+    _cache_generation += 1
+
+
+def _invalidate_embedding_cache():
+    """Drop the cache after an update/delete; it is rebuilt on next use"""
+    global _embedding_cache, _cache_generation
+    _embedding_cache = _EmbeddingCache()
+    _cache_generation += 1
+
+
+async def _reload_embedding_cache():
+    """Build a fresh cache on CPU_POOL and swap it in unless a write happened meanwhile"""
+    global _embedding_cache
+    generation = _cache_generation
+    cache = await run_cpu_bound(_EmbeddingCache.build, get_face_database())
+    if generation == _cache_generation:
+        _embedding_cache = cache
+
+
+def _on_cache_refresh_done(task: asyncio.Task):
+    if task.cancelled():
+        return
+    error = task.exception()
+    if error is not None:
+        print(f"⚠️ Embedding cache refresh failed: {error}")
+        # Keep serving the current cache and retry after another TTL
+        _embedding_cache.loaded_at = time.monotonic()
+
+
+def _start_cache_refresh() -> asyncio.Task:
+    """Start a background rebuild, or join the one already running"""
+    global _cache_refresh
+    loop = asyncio.get_running_loop()
+    if _cache_refresh is None or _cache_refresh.done() or _cache_refresh.get_loop() is not loop:
+        _cache_refresh = loop.create_task(_reload_embedding_cache())
+        _cache_refresh.add_done_callback(_on_cache_refresh_done)
+    return _cache_refresh
+
+
+async def _get_embedding_cache() -> _EmbeddingCache:
+    """
+    Get the embedding cache
+    
+    The first load is awaited; after that a stale cache keeps serving while
+    a background task rebuilds it, so no request waits on a full reload.
+    
+    Raises:
+        HTTPException: 503 if the database cannot be read; a failed load
+        is never cached as an empty face table
+    """
     try:
-        detector = get_face_detector()
-        detector_available = detector.detector is not None
-    except Exception:
-        detector_available = False
+        # Loop in case a write raced with the build and it was not swapped in
+        while not _embedding_cache.is_loaded:
+            await asyncio.shield(_start_cache_refresh())
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Face database unavailable: {str(e)}")
+    
+    if _embedding_cache.is_stale:
+        _start_cache_refresh()
+    return _embedding_cache
+
+
+# Model availability, probed once by load_models() and served by /health
+_model_status: Optional[Dict[str, bool]] = None
+
+
+def load_models() -> Dict[str, bool]:
+    """
+    Eagerly initialize the model and database singletons
+    
+    Called once at startup so the first request does not pay model
+    loading on the event loop. The result is cached for /health.
+    
+    Returns:
+        Availability of each model
+    """
+    global _model_status
+    status = {}
     
     try:
-        recognizer = get_face_recognizer()
-        recognizer_available = recognizer.app is not None
-    except Exception:
-        recognizer_available = False
+        status["face_detector"] = get_face_detector().detector is not None
+    except Exception as e:
+        print(f"⚠️ Face detector not available: {e}")
+        status["face_detector"] = False
+    
+    try:
+        status["face_recognizer"] = get_face_recognizer().app is not None
+    except Exception as e:
+        print(f"⚠️ Face recognizer not available: {e}")
+        status["face_recognizer"] = False
+    
+    try:
+        get_fas_predictor()
+        status["anti_spoofing"] = True
+    except Exception as e:
+        print(f"⚠️ Anti-spoofing not available: {e}")
+        status["anti_spoofing"] = False
     
+    # Reconcile the in-memory user count served by /health
     try:
-        anti_spoof = get_fas_predictor()
-        anti_spoof_available = True
-    except Exception:
-        anti_spoof_available = False
+        get_face_database().refresh_user_count()
+    except Exception as e:
+        print(f"⚠️ Could not count users: {e}")
+    
+    _model_status = status
+    return status
+
+
+def rebuild_embedding_index() -> int:
+    """
+    Reload the embedding cache from the database (blocking, for startup)
+    
+    Returns:
+        Number of faces indexed
+    """
+    global _embedding_cache
+    _embedding_cache = _EmbeddingCache.build(get_face_database())
+    return len(_embedding_cache.user_ids)
+
+
+async def refresh_embedding_index() -> int:
+    """
+    Rebuild the embedding cache off the event loop (for /cache/refresh)
+    
+    Returns:
+        Number of faces indexed
+    """
+    await _reload_embedding_cache()
+    return len(_embedding_cache.user_ids)
+
+
+def get_embedding_index_status() -> Dict:
+    """Describe the embedding cache used by recognition, check-in and dedup"""
+    cache = _embedding_cache
+    return {
+        "is_loaded": cache.is_loaded,
+        "faces": len(cache.user_ids),
+        "age_seconds": round(time.monotonic() - cache.loaded_at, 1) if cache.is_loaded else None,
+        "backend": "faiss" if cache.index is not None else "numpy",
+    }
+
+
+@router.get("/health", response_model=HealthResponse)
+async def health_check():
+    """
+    Health check endpoint
+    
+    Serves the model availability cached at startup; only the user
+    count is queried per call.
+    """
+    models_loaded = _model_status if _model_status is not None else load_models()
     
     return HealthResponse(
         status="healthy",
         version="1.0.0",
-        models_loaded={
-            "face_detector": detector_available,
-            "face_recognizer": recognizer_available,
-            "anti_spoofing": anti_spoof_available
-        },
-        database_users=db.get_user_count()
+        models_loaded=models_loaded,
+        database_users=get_face_database().get_user_count()
+    )
+
+
+@router.get("/ready", response_model=HealthResponse)
+async def readiness_check():
+    """
+    Readiness check endpoint
+    
+    Re-probes model availability (off the event loop, since a missing model
+    is loaded during the probe) and responds 503 until every model is loaded.
+    """
+    models_loaded = await run_cpu_bound(load_models)
+    is_ready = all(models_loaded.values())
+    
+    response = HealthResponse(
+        status="ready" if is_ready else "not_ready",
+        version="1.0.0",
+        models_loaded=models_loaded,
+        database_users=get_face_database().get_user_count()
     )
+    
+    if not is_ready:
+        return ORJSONResponse(status_code=503, content=response.model_dump())
+    return response
 
 
 @router.post("/detect_face", response_model=DetectFaceResponse)
@@ -82,10 +378,10 @@ async def detect_face(file: UploadFile = File(...)):
     Returns bounding boxes and facial landmarks for all detected faces.
     """
     # Read image
-    contents = await file.read()
+    _check_upload_size(file)
     
     try:
-        image = load_image_from_bytes(contents)
+        image = await run_cpu_bound(load_image_from_file, file.file)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid image: {str(e)}")
     
@@ -93,28 +389,31 @@ async def detect_face(file: UploadFile = File(...)):
     detector = get_face_detector()
     
     try:
-        detections = detector.detect_faces(image)
+        detections = await run_cpu_bound(detector.detect_faces, image)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Detection failed: {str(e)}")
     
-    # Format response
-    faces = []
-    for det in detections:
-        face = FaceDetection(
-            box=det['box'],
-            confidence=det['confidence'],
-            landmarks=det.get('landmarks')
-        )
-        faces.append(face)
+    # Format response. Detections are already plain ints/floats from our own
+    # detector, so skip building and re-validating one FaceDetection per face
+    # (returning a Response bypasses response_model validation; it still
+    # documents the schema)
+    faces = [
+        {
+            'box': det['box'],
+            'confidence': det['confidence'],
+            'landmarks': det.get('landmarks')
+        }
+        for det in detections
+    ]
     
     height, width = image.shape[:2]
     
-    return DetectFaceResponse(
-        success=True,
-        faces_count=len(faces),
-        faces=faces,
-        image_size={"width": width, "height": height}
-    )
+    return ORJSONResponse({
+        'success': True,
+        'faces_count': len(faces),
+        'faces': faces,
+        'image_size': {"width": width, "height": height}
+    })
 
 
 @router.post("/recognize_face", response_model=RecognizeFaceResponse)
@@ -128,21 +427,19 @@ async def recognize_face(
     Returns best matches for each detected face.
     """
     # Read image
-    contents = await file.read()
+    _check_upload_size(file)
     
     try:
-        image = load_image_from_bytes(contents)
+        image = await run_cpu_bound(load_image_from_file, file.file)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid image: {str(e)}")
     
-    # Get detector, recognizer and database
+    # Get detector
     detector = get_face_detector()
-    recognizer = get_face_recognizer()
-    db = get_face_database()
     
     try:
         # Use MTCNN for detection + alignment (optimized pipeline)
-        aligned_faces = detector.extract_aligned_faces(image)
+        aligned_faces = await run_cpu_bound(detector.extract_aligned_faces, image)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Detection failed: {str(e)}")
     
@@ -155,12 +452,14 @@ async def recognize_face(
         )
     
     # Extract embeddings using direct ArcFace model (no redundant detection)
+    # (batched with faces from concurrent requests)
+    embeddings = await get_embedding_batcher().embed([aligned for aligned, _ in aligned_faces])
+    
     face_data = []
-    for aligned_face, detection in aligned_faces:
-        embedding = recognizer.get_embedding_direct(aligned_face)
+    for (aligned_face, detection), embedding in zip(aligned_faces, embeddings):
         if embedding is not None:
             face_data.append({
-                'embedding': embedding.tolist(),
+                'embedding': embedding,
                 'box': detection['box'],
                 'confidence': detection['confidence']
             })
@@ -173,10 +472,10 @@ async def recognize_face(
             message="Failed to extract embeddings from detected faces"
         )
     
-    # Get all embeddings from database
-    db_embeddings = db.get_all_embeddings()
+    # Normalized database embeddings (N, 512)
+    cache = await _get_embedding_cache()
     
-    if not db_embeddings:
+    if not cache.user_ids:
         return RecognizeFaceResponse(
             success=True,
             faces_detected=len(face_data),
@@ -184,31 +483,31 @@ async def recognize_face(
             message="No faces in database to compare with"
         )
     
-    # Match each detected face
+    # Cosine similarity of every detected face against every stored face
+    queries = _l2_normalize(np.stack([face['embedding'] for face in face_data]).astype(np.float32))
+    best_sims, best_idx = cache.search(queries)
+    
+    # Build a match for each detected face
     matches = []
-    for face in face_data:
-        query_embedding = np.array(face['embedding'])
-        result = recognizer.recognize(query_embedding, db_embeddings, threshold=threshold)
+    for face, idx, similarity in zip(face_data, best_idx, best_sims):
+        user_id = cache.user_ids[idx]
+        similarity = float(similarity)
         
-        if result:
-            # Get name from database
-            db_face = db.get_face(result['user_id'])
-            name = db_face['name'] if db_face else None
-            
-            matches.append(RecognitionMatch(
-                user_id=result['user_id'],
-                name=name,
-                similarity=result['similarity'],
-                is_match=result['is_match'],
-                box=face['box']
-            ))
-
-    
-    return RecognizeFaceResponse(
-        success=True,
-        faces_detected=len(face_data),
-        matches=matches
-    )
+        matches.append({
+            'user_id': user_id,
+            'name': cache.names.get(user_id),
+            'similarity': similarity,
+            'is_match': similarity >= threshold,
+            'box': face['box']
+        })
+    
+    # Trusted internal data: serialize directly, as in detect_face
+    return ORJSONResponse({
+        'success': True,
+        'faces_detected': len(face_data),
+        'matches': matches,
+        'message': None
+    })
 
 
 
@@ -230,17 +529,17 @@ async def add_face(
     4. Store in database
     """
     # Read image
-    contents = await file.read()
+    _check_upload_size(file)
     
     try:
-        image = load_image_from_bytes(contents)
+        image = await run_cpu_bound(load_image_from_file, file.file)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid image: {str(e)}")
     
     # --- Step 1: Face Detection & Alignment ---
     detector = get_face_detector()
     try:
-        aligned_result = detector.get_largest_aligned_face(image)
+        aligned_result = await run_cpu_bound(detector.get_largest_aligned_face, image)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Detection failed: {str(e)}")
     
@@ -252,7 +551,7 @@ async def add_face(
     # --- Step 2: Anti-Spoofing Check (FAS) ---
     fas_predictor = get_fas_predictor()
     # FAS check on original image with detection box
-    fas_res = fas_predictor.predict(image) 
+    fas_res = await run_cpu_bound(fas_predictor.predict, image)
     
     if not fas_res['is_real'] or fas_res['score'] < config.FAS_ACCEPT_THRESHOLD:
         raise HTTPException(
@@ -261,39 +560,40 @@ async def add_face(
         )
     
     # --- Step 3: Identity Deduplication (FR Search) ---
-    recognizer = get_face_recognizer()
-    embedding = recognizer.get_embedding_direct(aligned_face)
+    embedding = await get_embedding_batcher().embed_one(aligned_face)
     if embedding is None:
         raise HTTPException(status_code=500, detail="Failed to extract face embedding")
         
     db = get_face_database()
-    all_faces = db.get_all_embeddings()
+    cache = await _get_embedding_cache()
     
-    for face_record in all_faces:
-        # Avoid comparing with self if updating (though this endpoint is for NEW adds)
-        if face_record['user_id'] == user_id:
-            continue
+    if cache.user_ids:
+        similarities = cache.similarities(embedding)
+        
+        for idx in np.flatnonzero(similarities >= config.FR_THRESHOLD):
+            # Avoid comparing with self if updating (though this endpoint is for NEW adds)
+            if cache.user_ids[idx] == user_id:
+                continue
             
-        similarity = recognizer.compute_similarity(embedding, face_record['embedding'])
-        if similarity >= config.FR_THRESHOLD:
             # Found a match in database
-            matched_name = face_record.get('name') or face_record['user_id']
+            matched_name = cache.names.get(cache.user_ids[idx]) or cache.user_ids[idx]
             raise HTTPException(
                 status_code=409, 
                 detail=f"Duplicate Identity: This face is already registered to user '{matched_name}'."
             )
     
     # --- Step 4: Store in Database ---
-    embedding_list = embedding.tolist()
     result = db.add_face(
         user_id=user_id,
-        embedding=embedding_list,
+        embedding=embedding,
         name=name
     )
     
     if not result['success']:
         raise HTTPException(status_code=409, detail=result['message'])
     
+    _add_to_embedding_cache(user_id, embedding, name)
+    
     return AddFaceResponse(
         success=True,
         message="Face profile secured and registered successfully.",
@@ -303,12 +603,17 @@ async def add_face(
 
 
 @router.get("/get_face/{user_id}", response_model=GetFaceResponse)
-async def get_face(user_id: str):
+async def get_face(
+    user_id: str,
+    include_embedding: bool = Query(False, description="Include the 512-d embedding in the response")
+):
     """
     Get face data for a user by their user_id
+    
+    The embedding is omitted unless include_embedding=true.
     """
     db = get_face_database()
-    face = db.get_face(user_id)
+    face = db.get_face(user_id, include_embedding=include_embedding)
     
     if face is None:
         return GetFaceResponse(
@@ -319,7 +624,7 @@ async def get_face(user_id: str):
     
     return GetFaceResponse(
         success=True,
-        data=face
+        data=FaceRecordFull(**face) if include_embedding else FaceRecordPublic(**face)
     )
 
 
@@ -334,6 +639,8 @@ async def delete_face(user_id: str):
     if not result['success']:
         raise HTTPException(status_code=404, detail=result['message'])
     
+    _invalidate_embedding_cache()
+    
     return DeleteFaceResponse(
         success=True,
         message=result['message']
@@ -364,21 +671,20 @@ async def mobile_checkin(
     
     # 2. Face Authentication
     # Read image
-    contents = await file.read()
+    _check_upload_size(file)
     
     try:
-        image = load_image_from_bytes(contents)
+        image = await run_cpu_bound(load_image_from_file, file.file)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid image: {str(e)}")
     
     
-    # Get detector and recognizer models
+    # Get detector model
     detector = get_face_detector()
-    recognizer = get_face_recognizer()
     
     try:
         # Use MTCNN for detection + alignment
-        aligned_result = detector.get_largest_aligned_face(image)
+        aligned_result = await run_cpu_bound(detector.get_largest_aligned_face, image)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Detection failed: {str(e)}")
     
@@ -396,7 +702,7 @@ async def mobile_checkin(
     # --- Step 3: Anti-Spoofing Check (FAS) ---
     fas_predictor = get_fas_predictor()
     try:
-        fas_result = fas_predictor.predict(image)
+        fas_result = await run_cpu_bound(fas_predictor.predict, image)
         fas_score = fas_result['score']
         is_real = fas_result['is_real'] and fas_score >= config.FAS_ACCEPT_THRESHOLD
         
@@ -418,7 +724,7 @@ async def mobile_checkin(
         )
     
     # --- Step 4: Extract embedding ---
-    embedding = recognizer.get_embedding_direct(aligned_face)
+    embedding = await get_embedding_batcher().embed_one(aligned_face)
 
     if embedding is None:
         return MobileCheckinResponse(
@@ -429,13 +735,10 @@ async def mobile_checkin(
             timestamp=timestamp
         )
     
-    embedding = embedding.tolist()
-    
     # Compare with database faces
-    db = get_face_database()
-    db_embeddings = db.get_all_embeddings()
+    cache = await _get_embedding_cache()
     
-    if not db_embeddings:
+    if not cache.user_ids:
         return MobileCheckinResponse(
             success=False,
             message="No faces in database to compare with",
@@ -444,12 +747,10 @@ async def mobile_checkin(
             timestamp=timestamp
         )
     
-    query_embedding = np.array(embedding)
-    
     # Use a higher threshold for check-in for stricter matching
     recognition_threshold = config.FR_THRESHOLD
     
-    result = recognizer.recognize(query_embedding, db_embeddings, threshold=recognition_threshold)
+    result = cache.best_match(embedding, threshold=recognition_threshold)
     
     if not result or not result['is_match']:
         return MobileCheckinResponse(
@@ -470,7 +771,7 @@ async def mobile_checkin(
             timestamp=timestamp
         )
 
-    match = recognizer.recognize(query_embedding, db_embeddings, threshold=recognition_threshold)
+    match = result
     
     if match and match['is_match']:
          # CHECK IF MATCHED USER IS THE LOGGED IN USER
@@ -484,8 +785,7 @@ async def mobile_checkin(
               )
 
          # Success! Log it
-         user = db.get_face(match['user_id'])
-         name = user['name'] if user else "Unknown"
+         name = cache.names.get(match['user_id'], "Unknown")
          
          logger = get_checkin_logger()
          logger.log_checkin(
@@ -536,9 +836,9 @@ async def checkin_fas(
         ))
 
     # 1. Read image
-    contents = await file.read()
+    _check_upload_size(file)
     try:
-        image = load_image_from_bytes(contents)
+        image = await run_cpu_bound(load_image_from_file, file.file)
     except Exception as e:
         add_step("loading", "failed", f"Invalid image: {str(e)}")
         return FASCheckinResponse(
@@ -552,7 +852,7 @@ async def checkin_fas(
     add_step("detecting", "pending", "Looking for face...")
     detector = get_face_detector()
     try:
-        aligned_result = detector.get_largest_aligned_face(image)
+        aligned_result = await run_cpu_bound(detector.get_largest_aligned_face, image)
     except Exception as e:
         add_step("detecting", "failed", f"Detection error: {str(e)}")
         return FASCheckinResponse(
@@ -579,7 +879,7 @@ async def checkin_fas(
     add_step("anti_spoofing", "pending", "Checking authenticity...")
     fas_predictor = get_fas_predictor()
     try:
-        fas_result = fas_predictor.predict(image)
+        fas_result = await run_cpu_bound(fas_predictor.predict, image)
         fas_score = fas_result['score']
         # Be strict for single-image check-in
         is_real = fas_result['is_real'] and fas_score >= config.FAS_ACCEPT_THRESHOLD
@@ -610,11 +910,9 @@ async def checkin_fas(
     
     # 4. Face Recognition
     add_step("recognizing", "pending", "Recognizing person...")
-    recognizer = get_face_recognizer()
-    db = get_face_database()
     
     try:
-        embedding = recognizer.get_embedding_direct(aligned_face)
+        embedding = await get_embedding_batcher().embed_one(aligned_face)
         if embedding is None:
             add_step("recognizing", "failed", "Failed to extract features")
             return FASCheckinResponse(
@@ -626,8 +924,8 @@ async def checkin_fas(
                 box=box
             )
         
-        db_embeddings = db.get_all_embeddings()
-        if not db_embeddings:
+        cache = await _get_embedding_cache()
+        if not cache.user_ids:
             add_step("recognizing", "failed", "Database empty")
             return FASCheckinResponse(
                 success=False,
@@ -638,7 +936,7 @@ async def checkin_fas(
                 box=box
             )
         
-        match = recognizer.recognize(embedding, db_embeddings, threshold=config.FR_THRESHOLD)
+        match = cache.best_match(embedding, threshold=config.FR_THRESHOLD)
         
         if match and match['is_match']:
             user_id = match['user_id']
@@ -658,8 +956,7 @@ async def checkin_fas(
                 )
             
             # Get user info
-            user_info = db.get_face(user_id)
-            name = user_info['name'] if user_info else "Unknown"
+            name = cache.names.get(user_id, "Unknown")
             
             # Combined confidence (simple mean for now)
             confidence = (fas_score + similarity) / 2
@@ -700,7 +997,9 @@ async def checkin_fas(
                 fas_score=fas_score,
                 box=box
             )
-            
+    
+    except HTTPException:
+        raise
     except Exception as e:
         add_step("recognizing", "error", f"Recognition error: {str(e)}")
         return FASCheckinResponse(
@@ -729,7 +1028,7 @@ async def update_face(
     db = get_face_database()
     
     # Check if user exists
-    existing = db.get_face(user_id)
+    existing = db.get_face(user_id, include_embedding=False)
     if existing is None:
         raise HTTPException(status_code=404, detail=f"User {user_id} not found")
     
@@ -737,13 +1036,13 @@ async def update_face(
     
     # If new image provided, extract embedding
     if file is not None and file.filename:
-        contents = await file.read()
+        _check_upload_size(file)
         
-        if not contents or len(contents) == 0:
+        if file.size == 0:
             raise HTTPException(status_code=400, detail="Empty file provided")
         
         try:
-            image = load_image_from_bytes(contents)
+            image = await run_cpu_bound(load_image_from_file, file.file)
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"Invalid image: {str(e)}")
         
@@ -752,10 +1051,9 @@ async def update_face(
         
         # Optimized pipeline: MTCNN detect + align, then direct embedding
         detector = get_face_detector()
-        recognizer = get_face_recognizer()
         
         try:
-            aligned_result = detector.get_largest_aligned_face(image)
+            aligned_result = await run_cpu_bound(detector.get_largest_aligned_face, image)
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Detection failed: {str(e)}")
         
@@ -767,11 +1065,9 @@ async def update_face(
         if aligned_face is None or aligned_face.size == 0:
             raise HTTPException(status_code=400, detail="Failed to align face")
         
-        embedding = recognizer.get_embedding_direct(aligned_face)
+        embedding = await get_embedding_batcher().embed_one(aligned_face)
         if embedding is None:
             raise HTTPException(status_code=500, detail="Failed to extract face embedding")
-        
-        embedding = embedding.tolist()
     
     # Check if anything to update
     if embedding is None and name is None:
@@ -787,6 +1083,10 @@ async def update_face(
         name=name
     )
     
+    # Embedding and name are both cached
+    if result['success']:
+        _invalidate_embedding_cache()
+    
     return UpdateFaceResponse(
         success=result['success'],
         message=result['message']
@@ -802,7 +1102,6 @@ from models.tracker import get_face_tracker
 from models.session_manager import get_session_manager
 from models.checkin_logger import get_checkin_logger
 from streaming.stream_processor import get_stream_processor
-import asyncio
 import base64
 import cv2
 
@@ -1,9 +1,25 @@
 """
 Pydantic Schemas for API Request/Response Models
 """
-from pydantic import BaseModel, Field
-from typing import List, Dict, Optional, Any
+from pydantic import BaseModel, Field, PlainValidator, PlainSerializer, WithJsonSchema
+from typing import List, Dict, Optional, Any, Annotated, Union
 from datetime import datetime
+import numpy as np
+
+
+def _to_float32_array(value: Any) -> np.ndarray:
+    """Coerce a list or array to a float32 numpy array"""
+    return np.asarray(value, dtype=np.float32)
+
+
+# Face embedding kept as a float32 array: validation is one np.asarray call
+# instead of 512 per-float checks, and it serializes back to a list of floats
+EmbeddingArray = Annotated[
+    np.ndarray,
+    PlainValidator(_to_float32_array),
+    PlainSerializer(lambda value: value.tolist(), return_type=List[float]),
+    WithJsonSchema({"type": "array", "items": {"type": "number"}}),
+]
 
 
 # ==================== Response Models ====================
@@ -77,21 +93,25 @@ class UpdateFaceRequest(BaseModel):
 
 # ==================== Database Response Models ====================
 
-class FaceRecord(BaseModel):
-    """Face record from database"""
+class FaceRecordPublic(BaseModel):
+    """Face record from database, without the embedding"""
     id: int
     user_id: str
     name: Optional[str]
-    embedding: List[float]
     metadata: Optional[Dict[str, Any]] = None
     created_at: str
     updated_at: str
 
 
+class FaceRecordFull(FaceRecordPublic):
+    """Face record from database, including the 512-d embedding"""
+    embedding: EmbeddingArray
+
+
 class GetFaceResponse(BaseModel):
     """Response for get face endpoint"""
     success: bool
-    data: Optional[FaceRecord] = None
+    data: Optional[Union[FaceRecordFull, FaceRecordPublic]] = None
     message: Optional[str] = None
 
 
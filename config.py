@@ -26,6 +26,14 @@ FACE_DETECTION_CONFIDENCE = 0.9
 FACE_SIZE = (112, 112)
 MAX_IMAGE_SIZE = (1920, 1080)
 FR_THRESHOLD = 0.5  # Face Recognition similarity threshold
+FR_BATCH_MAX_SIZE = 8   # Max aligned faces per batched embedding call
+FR_BATCH_WAIT_MS = 10   # Max time to wait for more faces before running a batch
+# Each worker reloads its recognition cache in the background after this many
+# seconds, so faces written via other workers show up. Until then a face deleted
+# through another worker can still be recognized/check in here, and add_face's
+# duplicate check can miss a face registered through another worker.
+# 0 disables the periodic reload (single-worker deployments).
+FR_CACHE_TTL_SECONDS = int(os.getenv("FR_CACHE_TTL_SECONDS", "30"))
 
 # === Quality Filtering Thresholds ===
 MIN_FACE_SIZE = 80      # Minimum face size in pixels
@@ -64,6 +72,16 @@ FUSION_WEIGHT_QUALITY = 0.1
 # === API & Network Settings ===
 API_HOST = os.getenv("API_HOST", "0.0.0.0")
 API_PORT = int(os.getenv("API_PORT", "8000"))
+APP_ENV = os.getenv("APP_ENV", "dev")  # "prod" runs multi-worker uvicorn with uvloop/httptools
+API_WORKERS = int(os.getenv("API_WORKERS", str(os.cpu_count() or 1)))  # Each worker loads its own models
+# CPU_POOL threads per process; in prod the cores are split across the workers
+CPU_POOL_WORKERS = max(1, (os.cpu_count() or 1) // API_WORKERS) if APP_ENV == "prod" else (os.cpu_count() or 1)
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(15 * 1024 * 1024)))  # Reject larger image uploads
+CORS_ORIGINS = [
+    origin.strip()
+    for origin in os.getenv("CORS_ORIGINS", "http://localhost:3000,http://localhost:8080").split(",")
+    if origin.strip()
+]  # Comma-separated browser origins allowed to call the API
 
 # === SQL Server Settings ===
 MSSQL_HOST = os.getenv("MSSQL_HOST", "localhost")
@@ -71,6 +89,7 @@ MSSQL_PORT = int(os.getenv("MSSQL_PORT", "1433"))
 MSSQL_USER = os.getenv("MSSQL_USER", "sa")
 MSSQL_PASSWORD = os.getenv("MSSQL_PASSWORD", "YourStrong@Passw0rd")
 MSSQL_DATABASE = os.getenv("MSSQL_DATABASE", "FaceCheckDB")
+MSSQL_POOL_SIZE = int(os.getenv("MSSQL_POOL_SIZE", "8"))  # Idle pyodbc connections kept by FaceDatabase
 
 # === Geolocation Settings ===
 _dynamic_config = load_dynamic_config()
@@ -1,11 +1,13 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 import uvicorn
 
 from api.routes import router
 from api.auth import router as auth_router
-from config import API_HOST, API_PORT
+from api.middleware import UploadSizeLimitMiddleware
+from config import API_HOST, API_PORT, APP_ENV, API_WORKERS, CORS_ORIGINS
 
 
 @asynccontextmanager
@@ -14,16 +16,28 @@ async def lifespan(app: FastAPI):
     FastAPI lifespan events for startup and shutdown.
     
     Startup:
+        - Load models
+        - Start embedding micro-batcher
         - Initialize database connection
         - Create tables if not exist
         - Load face embeddings into memory cache
+        - Build the recognition index
     
     Shutdown:
+        - Stop embedding micro-batcher
         - Close database connection
     """
     print("🚀 Starting Face Recognition API...")
     
     # === STARTUP ===
+    from api.routes import load_models
+    models_loaded = load_models()
+    print(f"🧠 Models loaded: {models_loaded}")
+    
+    # Start the embedding micro-batcher
+    from services.embedding_batcher import get_embedding_batcher
+    await get_embedding_batcher().start()
+    
     try:
         # Initialize SQL Server database
         from database.connection import init_database, test_connection
@@ -38,6 +52,11 @@ async def lifespan(app: FastAPI):
             face_service = get_face_service()
             await face_service.load_embeddings_to_memory()
             
+            # Build the recognition index used by /recognize_face
+            from api.routes import rebuild_embedding_index
+            indexed = rebuild_embedding_index()
+            print(f"✅ Recognition index built with {indexed} faces")
+            
             print("✅ Face Recognition API ready!")
         else:
             print("⚠️ SQL Server not available. Running without cache.")
@@ -50,6 +69,8 @@ async def lifespan(app: FastAPI):
     
     # === SHUTDOWN ===
     print("🔌 Shutting down...")
+    await get_embedding_batcher().stop()
+    
     try:
         from database.connection import close_database
         await close_database()
@@ -74,16 +95,21 @@ app = FastAPI(
     version="2.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
+# Reject oversized uploads before they are buffered (added first so CORS wraps the 413)
+app.add_middleware(UploadSizeLimitMiddleware)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "DELETE"],
+    allow_headers=["content-type", "authorization"],
+    max_age=86400,  # Let browsers cache preflight responses for a day
 )
 
 # Include API routes
@@ -104,31 +130,52 @@ async def root():
 
 @app.get("/cache/status")
 async def cache_status():
-    """Get face recognition cache status"""
+    """Get face recognition cache status (service cache and recognition index)"""
+    from api.routes import get_embedding_index_status
+    status = {"recognition_index": get_embedding_index_status()}
+    
     try:
         from services.face_recognition import get_face_service
         service = get_face_service()
-        return service.get_status()
+        status.update(service.get_status())
     except Exception as e:
-        return {"error": str(e), "is_loaded": False}
+        status.update({"error": str(e), "is_loaded": False})
+    
+    return status
 
 
 @app.post("/cache/refresh")
 async def cache_refresh():
-    """Manually refresh the face embeddings cache"""
+    """Manually refresh the recognition index and the face embeddings cache"""
     try:
+        from api.routes import refresh_embedding_index
+        indexed = await refresh_embedding_index()
+        
         from services.face_recognition import get_face_service
         service = get_face_service()
         count = await service.refresh_cache()
-        return {"success": True, "faces_loaded": count}
+        return {"success": True, "faces_loaded": count, "faces_indexed": indexed}
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 
 if __name__ == "__main__":
-    uvicorn.run(
-        "main:app",
-        host=API_HOST,
-        port=API_PORT,
-        reload=True
-    )
+    if APP_ENV == "prod":
+        # Every worker is a separate process with its own model singletons,
+        # embedding cache and batcher, so memory grows with API_WORKERS
+        uvicorn.run(
+            "main:app",
+            host=API_HOST,
+            port=API_PORT,
+            workers=API_WORKERS,
+            loop="uvloop",
+            http="httptools",
+            reload=False
+        )
+    else:
+        uvicorn.run(
+            "main:app",
+            host=API_HOST,
+            port=API_PORT,
+            reload=True
+        )
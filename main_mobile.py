@@ -1,5 +1,7 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, APIRouter
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 import uvicorn
 
 # Import route handlers from existing routes
@@ -10,24 +12,45 @@ from api.routes import (
     delete_face, 
     get_config, 
     update_config,
-    health_check
+    health_check,
+    readiness_check,
+    load_models
 )
-from config import API_HOST, API_PORT
+from api.middleware import UploadSizeLimitMiddleware
+from services.embedding_batcher import get_embedding_batcher
+from config import API_HOST, API_PORT, APP_ENV, API_WORKERS, CORS_ORIGINS
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load models and start the embedding batcher once at startup"""
+    models_loaded = load_models()
+    print(f"🧠 Models loaded: {models_loaded}")
+    await get_embedding_batcher().start()
+    yield
+    await get_embedding_batcher().stop()
+
 
 # Create FastAPI app
 app = FastAPI(
     title="Face Recognition Mobile API",
     description="Streamlined API for Mobile Check-in",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
+# Reject oversized uploads before they are buffered (added first so CORS wraps the 413)
+app.add_middleware(UploadSizeLimitMiddleware)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "DELETE"],
+    allow_headers=["content-type", "authorization"],
+    max_age=86400,  # Let browsers cache preflight responses for a day
 )
 
 # Define Mobile Router
@@ -41,6 +64,7 @@ mobile_router.delete("/delete_face/{user_id}")(delete_face)
 mobile_router.get("/config")(get_config)
 mobile_router.post("/config")(update_config)
 mobile_router.get("/health")(health_check)
+mobile_router.get("/ready")(readiness_check)
 
 # Include Router
 app.include_router(mobile_router, prefix="/api/v1", tags=["Mobile API"])
@@ -55,14 +79,28 @@ async def root():
             "/api/v1/get_face/{user_id}",
             "/api/v1/delete_face/{user_id}",
             "/api/v1/config",
-            "/api/v1/health"
+            "/api/v1/health",
+            "/api/v1/ready"
         ]
     }
 
 if __name__ == "__main__":
-    uvicorn.run(
-        "main_mobile:app",
-        host=API_HOST,
-        port=API_PORT,
-        reload=True
-    )
+    if APP_ENV == "prod":
+        # Every worker is a separate process with its own model singletons,
+        # embedding cache and batcher, so memory grows with API_WORKERS
+        uvicorn.run(
+            "main_mobile:app",
+            host=API_HOST,
+            port=API_PORT,
+            workers=API_WORKERS,
+            loop="uvloop",
+            http="httptools",
+            reload=False
+        )
+    else:
+        uvicorn.run(
+            "main_mobile:app",
+            host=API_HOST,
+            port=API_PORT,
+            reload=True
+        )
@@ -9,7 +9,11 @@ import os
 import sys
 import cv2
 import time
+import threading
 import numpy as np
+import torch
+import torch.nn.functional as F
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional
 from dataclasses import dataclass, field
@@ -22,6 +26,7 @@ sys.path.insert(0, str(SILENT_FACE_DIR))
 # Import Silent-Face components
 from src.anti_spoof_predict import AntiSpoofPredict
 from src.generate_patches import CropImage
+from src.data_io import transform as trans
 from src.utility import parse_model_name
 
 # Import config
@@ -209,6 +214,17 @@ class FASPredictor:
         if not self.models:
             raise FileNotFoundError(f"No .pth models found in {self.model_dir}")
         
+        # AntiSpoofPredict.predict() reloads weights from disk on every call and
+        # keeps the active model on self, so load each network once up front
+        self._nets = {model_path: self._load_net(model_path) for model_path in self.models}
+        self._transform = trans.Compose([trans.ToTensor()])
+        
+        # The fused models are independent, so run them side by side
+        self._pool = ThreadPoolExecutor(max_workers=len(self.models))
+        
+        # The shared RetinaFace cv2.dnn net is not thread-safe
+        self._lock = threading.Lock()
+        
         print(f"✅ FAS: Loaded {len(self.models)} anti-spoofing models")
         for m in self.models:
             print(f"   - {m.name}")
@@ -242,38 +258,22 @@ class FASPredictor:
         start_time = time.time()
         
         try:
-            # Detect face (need to be in silent_face directory)
-            original_cwd = os.getcwd()
-            os.chdir(SILENT_FACE_DIR)
-            
-            bbox = self.predictor.get_bbox(face_image)
+            with self._lock:
+                bbox = self.predictor.get_bbox(face_image)
             
             if bbox is None or bbox[2] <= 0 or bbox[3] <= 0:
-                os.chdir(original_cwd)
                 return result
             
             result["bbox"] = bbox
             
-            # Multi-model fusion prediction
+            # Multi-model fusion prediction, one crop + forward pass per model in parallel
+            futures = [
+                self._pool.submit(self._predict_model, model_path, face_image, bbox)
+                for model_path in self.models
+            ]
             prediction = np.zeros((1, 3))
-            
-            for model_path in self.models:
-                model_name = model_path.name
-                h_input, w_input, model_type, scale = parse_model_name(model_name)
-                
-                param = {
-                    "org_img": face_image,
-                    "bbox": bbox,
-                    "scale": scale,
-                    "out_w": w_input,
-                    "out_h": h_input,
-                    "crop": True if scale else False,
-                }
-                
-                img_crop = self.cropper.crop(**param)
-                prediction += self.predictor.predict(img_crop, str(model_path))
-            
-            os.chdir(original_cwd)
+            for future in futures:
+                prediction += future.result()
             
             # Get result
             label_idx = np.argmax(prediction)
@@ -285,11 +285,40 @@ class FASPredictor:
             result["time_ms"] = (time.time() - start_time) * 1000
             
         except Exception as e:
-            os.chdir(original_cwd)
             print(f"⚠️ FAS prediction error: {e}")
         
         return result
     
+    def _load_net(self, model_path: Path) -> torch.nn.Module:
+        """Build one MiniFASNet and load its weights (done once per model)."""
+        self.predictor._load_model(str(model_path))
+        net = self.predictor.model
+        net.eval()
+        return net
+    
+    def _predict_model(self, model_path: Path, face_image: np.ndarray, bbox: list) -> np.ndarray:
+        """
+        Score one face with a single FAS model.
+        
+        Returns:
+            (1, 3) softmax output of the model
+        """
+        h_input, w_input, model_type, scale = parse_model_name(model_path.name)
+        
+        img_crop = self.cropper.crop(
+            org_img=face_image,
+            bbox=bbox,
+            scale=scale,
+            out_w=w_input,
+            out_h=h_input,
+            crop=True if scale else False,
+        )
+        
+        img = self._transform(img_crop).unsqueeze(0).to(self.predictor.device)
+        with torch.no_grad():
+            output = self._nets[model_path].forward(img)
+            return F.softmax(output, dim=1).cpu().numpy()
+    
     def predict_batch(self, face_images: List[np.ndarray]) -> List[dict]:
         """
         Predict on a batch of face images.
@@ -7,6 +7,7 @@ Logs check-in events and manages cooldown to prevent re-check-in.
 import sqlite3
 import json
 import os
+import threading
 from datetime import datetime, timedelta
 from typing import Dict, Optional, List
 from dataclasses import dataclass
@@ -69,13 +70,21 @@ class CheckinLogger:
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
         self.evidence_dir.mkdir(parents=True, exist_ok=True)
         
+        # One autocommit connection in WAL mode shared by all threads;
+        # readers don't block the writer, writes are serialized by the lock
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._conn.execute("PRAGMA mmap_size=268435456")
+        self._write_lock = threading.Lock()
+        
         self._init_db()
     
     def _get_connection(self) -> sqlite3.Connection:
-        """Get database connection"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Get the shared database connection"""
+        return self._conn
     
     def _init_db(self):
         """Initialize database tables"""
@@ -101,9 +110,6 @@ class CheckinLogger:
             CREATE INDEX IF NOT EXISTS idx_checkin_user_time 
             ON checkins(user_id, timestamp)
         """)
-        
-        conn.commit()
-        conn.close()
     
     def log_checkin(
         self,
@@ -138,23 +144,21 @@ class CheckinLogger:
         if evidence_frame is not None:
             evidence_path = self._save_evidence(user_id, evidence_frame)
         
-        cursor.execute("""
-            INSERT INTO checkins 
-            (user_id, camera_id, confidence, fas_score, similarity, evidence_path, metadata)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (
-            user_id,
-            camera_id,
-            confidence,
-            fas_score,
-            similarity,
-            evidence_path,
-            json.dumps(metadata) if metadata else None
-        ))
-        
-        record_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        with self._write_lock:
+            cursor.execute("""
+                INSERT INTO checkins 
+                (user_id, camera_id, confidence, fas_score, similarity, evidence_path, metadata)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (
+                user_id,
+                camera_id,
+                confidence,
+                fas_score,
+                similarity,
+                evidence_path,
+                json.dumps(metadata) if metadata else None
+            ))
+            record_id = cursor.lastrowid
         
         return CheckinRecord(
             id=record_id,
@@ -203,7 +207,6 @@ class CheckinLogger:
         """, (user_id, cutoff))
         
         count = cursor.fetchone()[0]
-        conn.close()
         
         return count > 0
     
@@ -220,7 +223,6 @@ class CheckinLogger:
         """, (user_id,))
         
         row = cursor.fetchone()
-        conn.close()
         
         if row is None:
             return None
@@ -273,7 +275,6 @@ class CheckinLogger:
         
         cursor.execute(query, params)
         rows = cursor.fetchall()
-        conn.close()
         
         return [
             CheckinRecord(
@@ -308,7 +309,6 @@ class CheckinLogger:
             """, (today,))
         
         count = cursor.fetchone()[0]
-        conn.close()
         
         return count
 
@@ -6,14 +6,16 @@ Embeddings stored as VARBINARY (binary format).
 """
 
 import os
+import queue
+import threading
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import numpy as np
 import pyodbc
 
 import sys
 sys.path.append('..')
-from config import MSSQL_HOST, MSSQL_PORT, MSSQL_USER, MSSQL_PASSWORD, MSSQL_DATABASE
+from config import MSSQL_HOST, MSSQL_PORT, MSSQL_USER, MSSQL_PASSWORD, MSSQL_DATABASE, MSSQL_POOL_SIZE
 
 
 def get_connection_string() -> str:
@@ -45,6 +47,74 @@ def bytes_to_numpy(data: bytes) -> Optional[np.ndarray]:
     return np.frombuffer(data, dtype=np.float32)
 
 
+class _PooledConnection:
+    """pyodbc connection whose close() hands it back to the pool instead of logging out"""
+    
+    def __init__(self, conn: pyodbc.Connection, pool: "ConnectionPool"):
+        self._conn = conn
+        self._pool = pool
+    
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+    
+    def close(self):
+        if self._conn is not None:
+            self._pool.release(self._conn)
+            self._conn = None
+
+
+class ConnectionPool:
+    """
+    Small thread-safe pool of pyodbc connections.
+    
+    Opening a SQL Server connection is a full TCP + TLS + login handshake,
+    so idle connections are reused across calls (and threads) instead.
+    """
+    
+    def __init__(self, conn_str: str, max_idle: int = None):
+        self._conn_str = conn_str
+        self._idle = queue.LifoQueue(maxsize=max_idle or MSSQL_POOL_SIZE)
+    
+    def acquire(self) -> _PooledConnection:
+        """Take a live idle connection, or open a new one if none is free"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return _PooledConnection(pyodbc.connect(self._conn_str), self)
+            
+            if self._is_alive(conn):
+                return _PooledConnection(conn, self)
+            
+            # Dropped by a server restart or idle/network timeout
+            self._discard(conn)
+    
+    def release(self, conn: pyodbc.Connection):
+        """Return a connection to the pool; broken or surplus ones are closed"""
+        try:
+            # End any transaction a failed statement left open
+            conn.rollback()
+            self._idle.put_nowait(conn)
+        except (pyodbc.Error, queue.Full):
+            self._discard(conn)
+    
+    @staticmethod
+    def _is_alive(conn: pyodbc.Connection) -> bool:
+        """Ping the server; far cheaper than the login a fresh connection needs"""
+        try:
+            conn.cursor().execute("SELECT 1").fetchone()
+            return True
+        except pyodbc.Error:
+            return False
+    
+    @staticmethod
+    def _discard(conn: pyodbc.Connection):
+        try:
+            conn.close()
+        except pyodbc.Error:
+            pass
+
+
 class FaceDatabase:
     """
     SQL Server database for storing face embeddings.
@@ -54,11 +124,17 @@ class FaceDatabase:
     def __init__(self):
         """Initialize database connection."""
         self._conn_str = get_connection_string()
+        self._pool = ConnectionPool(self._conn_str)
+        
+        # In-memory face count, reconciled with COUNT(*) on first use and
+        # kept current by add_face/delete_face
+        self._user_count: Optional[int] = None
+        self._count_lock = threading.Lock()
         print("✅ SQL Server FaceDatabase initialized")
     
     def _get_connection(self) -> pyodbc.Connection:
-        """Get database connection."""
-        return pyodbc.connect(self._conn_str)
+        """Get a pooled database connection (close() returns it to the pool)."""
+        return self._pool.acquire()
 
     # =========================================================================
     # User Authentication Methods (stubs for compatibility)
@@ -94,6 +170,7 @@ class FaceDatabase:
             last_id = int(row[0]) if row and row[0] else None
             
             conn.commit()
+            self._adjust_user_count(1)
             print(f"✅ Face added: user_id={user_id}, id={last_id}")
             return {'success': True, 'message': f'Face added for user {user_id}', 'id': last_id}
         except pyodbc.IntegrityError:
@@ -104,25 +181,29 @@ class FaceDatabase:
         finally:
             conn.close()
 
-    def get_face(self, user_id: str) -> Optional[Dict]:
-        """Get face data by user_id"""
+    def get_face(self, user_id: str, include_embedding: bool = True) -> Optional[Dict]:
+        """Get face data by user_id (the embedding column is only read if requested)"""
         conn = self._get_connection()
         cursor = conn.cursor()
         
         try:
-            cursor.execute("SELECT id, user_id, name_user, embedding, created_at FROM faces WHERE user_id = ?", (user_id,))
+            columns = "id, user_id, name_user, created_at"
+            if include_embedding:
+                columns += ", embedding"
+            cursor.execute(f"SELECT {columns} FROM faces WHERE user_id = ?", (user_id,))
             row = cursor.fetchone()
             if row:
-                embedding_array = bytes_to_numpy(row[3])
-                created = str(row[4]) if row[4] else datetime.now().isoformat()
-                return {
+                created = str(row[3]) if row[3] else datetime.now().isoformat()
+                face = {
                     'id': row[0],
                     'user_id': row[1],
                     'name': row[2],
-                    'embedding': embedding_array.tolist() if embedding_array is not None else None,
                     'created_at': created,
                     'updated_at': created  # Use same as created for compatibility
                 }
+                if include_embedding:
+                    face['embedding'] = bytes_to_numpy(row[4])
+                return face
         except Exception as e:
             print(f"Error getting face: {e}")
         finally:
@@ -172,23 +253,23 @@ class FaceDatabase:
             conn.commit()
             if cursor.rowcount == 0:
                 return {'success': False, 'message': f'User {user_id} not found'}
+            self._adjust_user_count(-cursor.rowcount)
             return {'success': True, 'message': f'Face deleted for user {user_id}'}
         finally:
             conn.close()
 
     def get_all_embeddings(self) -> List[Dict]:
-        """Get all face embeddings from database"""
+        """Get all face embeddings from database (as float32 numpy arrays)"""
         conn = self._get_connection()
         cursor = conn.cursor()
         results = []
         try:
             cursor.execute("SELECT user_id, name_user, embedding FROM faces")
             for row in cursor.fetchall():
-                embedding_array = bytes_to_numpy(row[2])
                 results.append({
                     'user_id': row[0],
                     'name': row[1],
-                    'embedding': embedding_array.tolist() if embedding_array is not None else None
+                    'embedding': bytes_to_numpy(row[2])
                 })
         except Exception as e:
             print(f"Error getting embeddings: {e}")
@@ -196,20 +277,66 @@ class FaceDatabase:
             conn.close()
         return results
 
+    def get_embedding_matrix(self) -> Tuple[List[str], List[Optional[str]], np.ndarray]:
+        """
+        Get all face embeddings as one (N, D) float32 matrix
+        
+        The VARBINARY blobs are concatenated and decoded with a single
+        np.frombuffer call instead of one array per row.
+        
+        Returns:
+            Tuple of (user_ids, names, matrix) with matching row order
+        
+        Raises:
+            pyodbc.Error: If the query fails. Not swallowed, so a failed
+            read is never mistaken for an empty face table.
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        user_ids, names, blobs = [], [], []
+        try:
+            cursor.execute("SELECT user_id, name_user, embedding FROM faces WHERE embedding IS NOT NULL")
+            for row in cursor.fetchall():
+                user_ids.append(row[0])
+                names.append(row[1])
+                blobs.append(row[2])
+        finally:
+            conn.close()
+        
+        if not blobs:
+            return [], [], np.empty((0, 512), dtype=np.float32)
+        
+        matrix = np.frombuffer(b"".join(blobs), dtype=np.float32).reshape(len(blobs), -1)
+        return user_ids, names, matrix
+
     def get_user_count(self) -> int:
-        """Get total number of users in database"""
+        """Get total number of users in database (served from memory after the first call)"""
+        if self._user_count is None:
+            return self.refresh_user_count()
+        return self._user_count
+
+    def refresh_user_count(self) -> int:
+        """Reconcile the in-memory user count with a COUNT(*) query"""
         conn = self._get_connection()
         cursor = conn.cursor()
         count = 0
         try:
             cursor.execute("SELECT COUNT(*) FROM faces")
             count = cursor.fetchone()[0]
+            with self._count_lock:
+                self._user_count = count
         except Exception as e:
             print(f"Error counting users: {e}")
         finally:
             conn.close()
         return count
 
+    def _adjust_user_count(self, delta: int):
+        """Apply an add/delete to the in-memory user count"""
+        with self._count_lock:
+            if self._user_count is not None:
+                self._user_count += delta
+
     def search_by_name(self, name_query: str) -> List[Dict]:
         """Search users by name (partial match)"""
         conn = self._get_connection()
@@ -13,7 +13,8 @@ except ImportError:
 
 import sys
 sys.path.append('..')
-from config import FACE_DETECTION_CONFIDENCE
+from config import FACE_DETECTION_CONFIDENCE, MAX_IMAGE_SIZE
+from utils.image_utils import fit_image
 
 # ArcFace standard alignment reference points for 112x112 image
 # Based on 5 landmarks: left_eye, right_eye, nose, mouth_left, mouth_right
@@ -60,6 +61,9 @@ class FaceDetector:
         """
         Detect faces in an image
         
+        Images larger than MAX_IMAGE_SIZE are downscaled for detection;
+        boxes and landmarks are always in original image coordinates.
+        
         Args:
             image: Input image in BGR format (OpenCV)
         
@@ -76,13 +80,23 @@ class FaceDetector:
         if image is None or image.size == 0:
             return []
         
+        # MTCNN cost scales with pixel count, so detect on a copy that fits MAX_IMAGE_SIZE
+        detect_image, scale = fit_image(image, MAX_IMAGE_SIZE)
+        
         # Convert BGR to RGB
-        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        image_rgb = cv2.cvtColor(detect_image, cv2.COLOR_BGR2RGB)
         pil_image = Image.fromarray(image_rgb)
         
         # Detect faces
         boxes, probs, landmarks = self.detector.detect(pil_image, landmarks=True)
         
+        # Map coordinates back onto the original image
+        if scale != 1.0:
+            if boxes is not None:
+                boxes = boxes / scale
+            if landmarks is not None:
+                landmarks = landmarks / scale
+        
         results = []
         if boxes is not None:
             for i, (box, prob) in enumerate(zip(boxes, probs)):
@@ -91,16 +91,14 @@ class EmbeddingAggregator:
         if len(self.embeddings) < 2:
             return 0.0
         
-        # Compute pairwise similarities of recent embeddings
-        recent = self.embeddings[-min(10, len(self.embeddings)):]
-        similarities = []
-        
-        for i in range(len(recent)):
-            for j in range(i + 1, len(recent)):
-                sim = 1 - cosine(recent[i], recent[j])
-                similarities.append(sim)
-        
-        return np.mean(similarities) if similarities else 0.0
+        # Compute pairwise similarities of recent embeddings in one Gram matrix
+        recent = np.asarray(self.embeddings[-min(10, len(self.embeddings)):], dtype=np.float32)
+        recent = recent / np.maximum(np.linalg.norm(recent, axis=1, keepdims=True), 1e-8)
+        similarities = recent @ recent.T
+
+        # Upper triangle = each unordered pair once
+        pairs = np.triu_indices(len(recent), k=1)
+        return float(np.mean(similarities[pairs]))
     
     def add_match_result(self, similarity: float):
         """Track similarity scores from recognition attempts"""
@@ -179,32 +177,47 @@ class FaceRecognizer:
         Returns:
             512-dimensional embedding vector or None if extraction fails
         """
+        embeddings = self.get_embeddings_batch([aligned_face])
+        return embeddings[0] if embeddings is not None else None
+    
+    def get_embeddings_batch(self, aligned_faces: List[np.ndarray]) -> Optional[np.ndarray]:
+        """
+        Extract embeddings for several pre-aligned faces (112x112) in one inference call.
+        
+        Args:
+            aligned_faces: Pre-aligned face images (112x112) in BGR format
+        
+        Returns:
+            (B, 512) embedding matrix, one row per face, or None if extraction fails
+        """
         if self.rec_model is None:
             raise RuntimeError("Recognition model not available. Please install insightface.")
         
         try:
-            # Ensure input is 112x112
-            if aligned_face.shape[:2] != (112, 112):
-                aligned_face = cv2.resize(aligned_face, (112, 112))
+            # Ensure inputs are 112x112
+            faces = [
+                face if face.shape[:2] == (112, 112) else cv2.resize(face, (112, 112))
+                for face in aligned_faces
+            ]
             
-            # Use cv2.dnn.blobFromImage for correct preprocessing
+            # Use cv2.dnn.blobFromImages for correct preprocessing
             # - Scale by 1/127.5
             # - Subtract mean (127.5, 127.5, 127.5)
             # - Swap BGR to RGB
-            blob = cv2.dnn.blobFromImage(
-                aligned_face, 
+            blob = cv2.dnn.blobFromImages(
+                faces, 
                 scalefactor=1.0/127.5, 
                 size=(112, 112), 
                 mean=(127.5, 127.5, 127.5), 
                 swapRB=True
             )
             
-            # Run inference directly with ONNX session
+            # Run inference directly with ONNX session on the (B, 3, 112, 112) batch
             input_name = self.rec_model.session.get_inputs()[0].name
             output = self.rec_model.session.run(None, {input_name: blob})
-            embedding = output[0].flatten()
+            embeddings = output[0].reshape(len(faces), -1)
             
-            return embedding
+            return embeddings
         except Exception as e:
             print(f"Embedding extraction failed: {e}")
             return None
@@ -312,25 +325,22 @@ class FaceRecognizer:
         if not database_embeddings:
             return None
         
-        best_match = None
-        best_similarity = -1
+        # Stack and normalize once so matching is a single matrix-vector product
+        db_matrix = np.asarray([entry['embedding'] for entry in database_embeddings], dtype=np.float32)
+        db_matrix /= np.maximum(np.linalg.norm(db_matrix, axis=1, keepdims=True), 1e-8)
         
-        for db_entry in database_embeddings:
-            db_embedding = db_entry['embedding']
-            if isinstance(db_embedding, list):
-                db_embedding = np.array(db_embedding)
-            
-            similarity = self.compute_similarity(query_embedding, db_embedding)
-            
-            if similarity > best_similarity:
-                best_similarity = similarity
-                best_match = {
-                    'user_id': db_entry['user_id'],
-                    'similarity': similarity,
-                    'is_match': similarity >= threshold
-                }
-        
-        return best_match
+        query = np.asarray(query_embedding, dtype=np.float32)
+        query = query / max(float(np.linalg.norm(query)), 1e-8)
+        
+        similarities = db_matrix @ query
+        best_idx = int(np.argmax(similarities))
+        best_similarity = float(similarities[best_idx])
+        
+        return {
+            'user_id': database_embeddings[best_idx]['user_id'],
+            'similarity': best_similarity,
+            'is_match': best_similarity >= threshold
+        }
     
     def compare_faces(
         self,
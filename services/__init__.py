@@ -1,4 +1,5 @@
 # Services package
 from .face_recognition import FaceRecognitionService, get_face_service
+from .embedding_batcher import EmbeddingBatcher, get_embedding_batcher
 
-__all__ = ["FaceRecognitionService", "get_face_service"]
+__all__ = ["FaceRecognitionService", "get_face_service", "EmbeddingBatcher", "get_embedding_batcher"]
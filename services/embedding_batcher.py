@@ -0,0 +1,209 @@
+"""
+Embedding Micro-Batcher
+
+Coalesces aligned faces from concurrent requests into a single ArcFace
+inference call instead of running the model once per face.
+
+Features:
+- asyncio.Queue fed by request handlers
+- Drains up to FR_BATCH_MAX_SIZE faces or waits at most FR_BATCH_WAIT_MS
+- Runs the batch on the shared CPU_POOL and fans results back per request
+- Falls back to per-face inference if a batch fails, so one bad face
+  only affects its own request
+"""
+
+import asyncio
+import numpy as np
+from typing import List, Optional, Tuple
+import sys
+sys.path.append('..')
+
+from config import FR_BATCH_MAX_SIZE, FR_BATCH_WAIT_MS
+from models.face_recognizer import get_face_recognizer
+from utils.concurrency import CPU_POOL
+
+
+class BatcherStoppedError(RuntimeError):
+    """Raised to requests still waiting when the batcher is stopped"""
+
+
+class EmbeddingBatcher:
+    """
+    Async micro-batcher for face embedding extraction.
+    
+    Each caller submits the aligned faces of one request and awaits a
+    future; a single worker task stacks queued faces into one
+    (B, 3, 112, 112) batch and splits the embeddings back per caller.
+    """
+    
+    def __init__(self, max_batch_size: int = None, max_wait_ms: float = None):
+        """
+        Initialize embedding batcher.
+        
+        Args:
+            max_batch_size: Max faces per inference call (default from config)
+            max_wait_ms: Max wait for more faces before running (default from config)
+        """
+        self.max_batch_size = max_batch_size or FR_BATCH_MAX_SIZE
+        self.max_wait = (max_wait_ms if max_wait_ms is not None else FR_BATCH_WAIT_MS) / 1000.0
+        
+        self.queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    @property
+    def is_running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+    
+    async def start(self):
+        """Start the batching worker on the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self.is_running and self._loop is loop:
+            return
+        
+        self._loop = loop
+        self.queue = asyncio.Queue()
+        self._worker = loop.create_task(self._run())
+    
+    async def stop(self):
+        """Stop the batching worker and fail requests still waiting on it"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        
+        if self.queue is not None:
+            pending = []
+            while not self.queue.empty():
+                pending.append(self.queue.get_nowait())
+            self._fail(pending, BatcherStoppedError("Embedding batcher stopped"))
+        
+        self._worker = None
+        self.queue = None
+    
+    async def embed(self, aligned_faces: List[np.ndarray]) -> List[Optional[np.ndarray]]:
+        """
+        Get embeddings for the aligned faces of one request.
+        
+        Args:
+            aligned_faces: Pre-aligned face images (112x112) in BGR format
+        
+        Returns:
+            One 512-d embedding per face (None where extraction failed)
+        """
+        if not aligned_faces:
+            return []
+        
+        # (Re)start lazily, e.g. when no lifespan ran or the loop changed
+        if not self.is_running or self._loop is not asyncio.get_running_loop():
+            await self.start()
+        
+        future = self._loop.create_future()
+        await self.queue.put((aligned_faces, future))
+        return await future
+    
+    async def embed_one(self, aligned_face: np.ndarray) -> Optional[np.ndarray]:
+        """Get the embedding for a single aligned face"""
+        return (await self.embed([aligned_face]))[0]
+    
+    async def _collect(self) -> List[Tuple[List[np.ndarray], asyncio.Future]]:
+        """Wait for one request, then gather more until the batch is full or the window closes"""
+        items = [await self.queue.get()]
+        count = len(items[0][0])
+        deadline = self._loop.time() + self.max_wait
+        
+        try:
+            while count < self.max_batch_size:
+                timeout = deadline - self._loop.time()
+                try:
+                    if timeout <= 0:
+                        item = self.queue.get_nowait()
+                    else:
+                        item = await asyncio.wait_for(self.queue.get(), timeout)
+                except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                    break
+                items.append(item)
+                count += len(item[0])
+        except asyncio.CancelledError:
+            self._fail(items, BatcherStoppedError("Embedding batcher stopped"))
+            raise
+        
+        return items
+    
+    async def _run(self):
+        """Worker loop: collect a batch, run inference on CPU_POOL, fan out results"""
+        while True:
+            items = await self._collect()
+            
+            try:
+                results = await self._embed_items(items)
+            except asyncio.CancelledError:
+                self._fail(items, BatcherStoppedError("Embedding batcher stopped"))
+                raise
+            except Exception as e:
+                self._fail(items, e)
+                continue
+            
+            for (_, future), result in zip(items, results):
+                if not future.done():
+                    future.set_result(result)
+    
+    async def _embed_items(self, items) -> List[List[Optional[np.ndarray]]]:
+        """Embed every queued face in one batch and split the results per request"""
+        faces = [face for item_faces, _ in items for face in item_faces]
+        recognizer = get_face_recognizer()
+        
+        embeddings = await self._loop.run_in_executor(
+            CPU_POOL, recognizer.get_embeddings_batch, faces
+        )
+        
+        if embeddings is None and len(faces) > 1:
+            # The batch failed as a whole; retry face by face so a bad face
+            # only costs its own request its embedding
+            embeddings = []
+            for face in faces:
+                single = await self._loop.run_in_executor(
+                    CPU_POOL, recognizer.get_embeddings_batch, [face]
+                )
+                embeddings.append(None if single is None else single[0])
+        
+        results = []
+        offset = 0
+        for item_faces, _ in items:
+            count = len(item_faces)
+            if embeddings is None:
+                results.append([None] * count)
+            else:
+                results.append(list(embeddings[offset:offset + count]))
+            offset += count
+        
+        return results
+    
+    @staticmethod
+    def _fail(items, error: Exception):
+        """Resolve the futures of unfinished requests with an error"""
+        for _, future in items:
+            if not future.done():
+                future.set_exception(error)
+
+
+# =============================================================================
+# Singleton Accessor
+# =============================================================================
+
+_batcher_instance: Optional[EmbeddingBatcher] = None
+
+
+def get_embedding_batcher() -> EmbeddingBatcher:
+    """
+    Get singleton instance of EmbeddingBatcher.
+    
+    Returns:
+        EmbeddingBatcher: The singleton instance
+    """
+    global _batcher_instance
+    if _batcher_instance is None:
+        _batcher_instance = EmbeddingBatcher()
+    return _batcher_instance
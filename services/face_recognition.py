@@ -415,8 +415,10 @@ class FaceRecognitionService:
         
         similarities = np.dot(input_norm, normalized_cache.T).flatten()
         
-        # Get top-k indices
-        top_indices = np.argsort(similarities)[::-1][:k]
+        # Get top-k indices: O(N) partition, then sort only the k winners
+        k = min(k, len(similarities))
+        top_indices = np.argpartition(-similarities, k - 1)[:k]
+        top_indices = top_indices[np.argsort(-similarities[top_indices])]
         
         results = []
         for idx in top_indices:
@@ -7,6 +7,7 @@ import numpy as np
 import sys
 sys.path.insert(0, '..')
 from main import app
+import api.routes as routes
 
 client = TestClient(app)
 
@@ -26,6 +27,25 @@ def create_test_image(width: int = 200, height: int = 200) -> bytes:
     return buffer.getvalue()
 
 
+class StubFaceDatabase:
+    """In-memory stand-in for the SQL Server FaceDatabase"""
+    
+    def __init__(self, faces: dict = None):
+        self.faces = faces or {}
+    
+    def get_user_count(self) -> int:
+        return len(self.faces)
+    
+    def get_face(self, user_id: str, include_embedding: bool = True):
+        face = self.faces.get(user_id)
+        if face is None:
+            return None
+        face = dict(face)
+        if not include_embedding:
+            face.pop('embedding', None)
+        return face
+
+
 class TestHealthEndpoint:
     """Tests for health check endpoint"""
     
@@ -39,6 +59,44 @@ class TestHealthEndpoint:
         assert 'database_users' in data
 
 
+STORED_FACE = {
+    'id': 1,
+    'user_id': 'alice',
+    'name': 'Alice',
+    'created_at': '2024-01-01 00:00:00',
+    'updated_at': '2024-01-01 00:00:00',
+    'embedding': np.linspace(-1.0, 1.0, 512, dtype=np.float32),
+}
+
+
+class TestReadinessEndpoint:
+    """Tests for readiness endpoint"""
+    
+    def test_ready_when_all_models_loaded(self, monkeypatch):
+        """Test readiness returns 200 once every model is available"""
+        models = {"face_detector": True, "face_recognizer": True, "anti_spoofing": True}
+        monkeypatch.setattr(routes, "load_models", lambda: models)
+        monkeypatch.setattr(routes, "get_face_database", lambda: StubFaceDatabase())
+        
+        response = client.get("/api/v1/ready")
+        assert response.status_code == 200
+        data = response.json()
+        assert data['status'] == 'ready'
+        assert data['models_loaded'] == models
+    
+    def test_not_ready_when_a_model_is_missing(self, monkeypatch):
+        """Test readiness returns 503 while any model is unavailable"""
+        models = {"face_detector": True, "face_recognizer": True, "anti_spoofing": False}
+        monkeypatch.setattr(routes, "load_models", lambda: models)
+        monkeypatch.setattr(routes, "get_face_database", lambda: StubFaceDatabase())
+        
+        response = client.get("/api/v1/ready")
+        assert response.status_code == 503
+        data = response.json()
+        assert data['status'] == 'not_ready'
+        assert data['models_loaded']['anti_spoofing'] is False
+
+
 class TestRootEndpoint:
     """Tests for root endpoint"""
     
@@ -84,6 +142,28 @@ class TestFaceDatabase:
         assert data['success'] is False
         assert 'not found' in data['message'].lower()
     
+    def test_get_face_omits_embedding_by_default(self, monkeypatch):
+        """Test get_face leaves out the embedding unless asked for it"""
+        monkeypatch.setattr(routes, "get_face_database", lambda: StubFaceDatabase({"alice": STORED_FACE}))
+        
+        response = client.get("/api/v1/get_face/alice")
+        assert response.status_code == 200
+        data = response.json()
+        assert data['success'] is True
+        assert data['data']['user_id'] == 'alice'
+        assert data['data']['name'] == 'Alice'
+        assert 'embedding' not in data['data']
+    
+    def test_get_face_includes_embedding_on_request(self, monkeypatch):
+        """Test include_embedding=true returns the embedding as a list of floats"""
+        monkeypatch.setattr(routes, "get_face_database", lambda: StubFaceDatabase({"alice": STORED_FACE}))
+        
+        response = client.get("/api/v1/get_face/alice", params={"include_embedding": "true"})
+        assert response.status_code == 200
+        embedding = response.json()['data']['embedding']
+        assert len(embedding) == 512
+        assert embedding == pytest.approx(STORED_FACE['embedding'].tolist())
+    
     def test_delete_nonexistent_face(self):
         """Test deleting a face that doesn't exist"""
         response = client.delete("/api/v1/delete_face/nonexistent_user_123")
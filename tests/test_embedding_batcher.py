@@ -0,0 +1,108 @@
+import pytest
+import asyncio
+import threading
+import numpy as np
+
+import sys
+sys.path.insert(0, '..')
+from services import embedding_batcher
+from services.embedding_batcher import EmbeddingBatcher, BatcherStoppedError
+
+
+def make_face(value: int) -> np.ndarray:
+    """Create an aligned face whose stub embedding is its pixel value"""
+    return np.full((112, 112, 3), value, dtype=np.uint8)
+
+
+class StubRecognizer:
+    """Embeds a face as [pixel value] * 4; fails any batch containing bad_value"""
+
+    def __init__(self, bad_value: int = None):
+        self.bad_value = bad_value
+        self.batch_sizes = []
+
+    def get_embeddings_batch(self, faces):
+        self.batch_sizes.append(len(faces))
+        if any(face[0, 0, 0] == self.bad_value for face in faces):
+            return None
+        return np.stack([np.full(4, face[0, 0, 0], dtype=np.float32) for face in faces])
+
+
+def embed_concurrently(requests, max_batch_size: int = 16):
+    """Submit every request at once and return the per-request results"""
+    async def scenario():
+        batcher = EmbeddingBatcher(max_batch_size=max_batch_size, max_wait_ms=50)
+        await batcher.start()
+        results = await asyncio.gather(*[batcher.embed(faces) for faces in requests])
+        await batcher.stop()
+        return results
+
+    return asyncio.run(scenario())
+
+
+def as_values(results):
+    return [[None if e is None else int(e[0]) for e in result] for result in results]
+
+
+class TestEmbeddingBatcher:
+    """Tests for the embedding micro-batcher"""
+
+    def test_fan_out_keeps_request_order(self, monkeypatch):
+        """Concurrent requests share one batch and each gets its own embeddings back"""
+        stub = StubRecognizer()
+        monkeypatch.setattr(embedding_batcher, "get_face_recognizer", lambda: stub)
+
+        requests = [
+            [make_face(1), make_face(2)],
+            [make_face(3)],
+            [make_face(4), make_face(5), make_face(6)],
+        ]
+        results = embed_concurrently(requests)
+
+        assert as_values(results) == [[1, 2], [3], [4, 5, 6]]
+        assert stub.batch_sizes == [6]
+
+    def test_failed_batch_falls_back_per_face(self, monkeypatch):
+        """One bad face only fails its own request, not the rest of the batch"""
+        stub = StubRecognizer(bad_value=3)
+        monkeypatch.setattr(embedding_batcher, "get_face_recognizer", lambda: stub)
+
+        requests = [
+            [make_face(1), make_face(2)],
+            [make_face(3)],
+            [make_face(4)],
+        ]
+        results = embed_concurrently(requests)
+
+        assert as_values(results) == [[1, 2], [None], [4]]
+        assert stub.batch_sizes == [4, 1, 1, 1, 1]
+
+    def test_stop_fails_pending_requests(self, monkeypatch):
+        """Requests in flight or still queued are failed instead of hanging"""
+        release = threading.Event()
+
+        class BlockingRecognizer:
+            def get_embeddings_batch(self, faces):
+                release.wait(5)
+                return np.zeros((len(faces), 4), dtype=np.float32)
+
+        monkeypatch.setattr(embedding_batcher, "get_face_recognizer", lambda: BlockingRecognizer())
+
+        async def scenario():
+            batcher = EmbeddingBatcher(max_batch_size=1, max_wait_ms=0)
+            await batcher.start()
+            in_flight = asyncio.ensure_future(batcher.embed_one(make_face(1)))
+            queued = asyncio.ensure_future(batcher.embed_one(make_face(2)))
+            await asyncio.sleep(0.05)
+
+            await batcher.stop()
+            release.set()
+            return await asyncio.gather(in_flight, queued, return_exceptions=True)
+
+        results = asyncio.run(scenario())
+
+        assert all(isinstance(result, BatcherStoppedError) for result in results)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,107 @@
+import pytest
+import numpy as np
+
+import sys
+sys.path.insert(0, '..')
+from config import MAX_IMAGE_SIZE
+from models.face_detector import FaceDetector
+from utils.image_utils import fit_image
+
+
+class StubMTCNN:
+    """Returns one fixed face (in the coordinates of the image it is given)"""
+
+    def __init__(self, box, landmarks):
+        self.box = box
+        self.landmarks = landmarks
+        self.seen_sizes = []
+
+    def detect(self, pil_image, landmarks=True):
+        self.seen_sizes.append(pil_image.size)  # (width, height)
+        return (
+            np.array([self.box], dtype=np.float32),
+            np.array([0.99], dtype=np.float32),
+            np.array([self.landmarks], dtype=np.float32),
+        )
+
+
+def make_detector(stub: StubMTCNN) -> FaceDetector:
+    """FaceDetector wired to a stub instead of loading MTCNN weights"""
+    detector = FaceDetector.__new__(FaceDetector)
+    detector.detector = stub
+    return detector
+
+
+LANDMARKS = [[10, 20], [30, 20], [20, 30], [12, 40], [28, 40]]
+
+
+class TestFitImage:
+    """Tests for fit_image"""
+
+    def test_small_image_untouched(self):
+        """Test an image inside MAX_IMAGE_SIZE is returned as-is"""
+        image = np.zeros((480, 640, 3), dtype=np.uint8)
+        resized, scale = fit_image(image, MAX_IMAGE_SIZE)
+        assert resized is image
+        assert scale == 1.0
+
+    def test_portrait_respects_width_height_order(self):
+        """Test MAX_IMAGE_SIZE is (width, height), so a tall image is bounded by height"""
+        image = np.zeros((3840, 2160, 3), dtype=np.uint8)  # (h, w): portrait 4K
+        resized, scale = fit_image(image, MAX_IMAGE_SIZE)
+        height, width = resized.shape[:2]
+        assert height == MAX_IMAGE_SIZE[1]
+        assert width <= MAX_IMAGE_SIZE[0]
+        assert scale == pytest.approx(MAX_IMAGE_SIZE[1] / 3840)
+
+
+class TestDetectFacesDownscale:
+    """Tests that detection runs downscaled but reports original coordinates"""
+
+    def test_landscape_4k(self):
+        """Test a 4K frame is detected at <= MAX_IMAGE_SIZE and boxes map back"""
+        stub = StubMTCNN(box=[100, 200, 300, 400], landmarks=LANDMARKS)
+        image = np.zeros((2160, 3840, 3), dtype=np.uint8)
+
+        detections = make_detector(stub).detect_faces(image)
+
+        width, height = stub.seen_sizes[0]
+        assert width <= MAX_IMAGE_SIZE[0] and height <= MAX_IMAGE_SIZE[1]
+        assert (width, height) == (1920, 1080)
+
+        # Scale is 0.5, so coordinates double
+        assert detections[0]['box'] == [200, 400, 600, 800]
+        assert detections[0]['landmarks']['left_eye'] == pytest.approx([20, 40])
+        assert detections[0]['landmarks']['mouth_right'] == pytest.approx([56, 80])
+
+    def test_portrait_4k(self):
+        """Test a portrait 4K frame is bounded by height and boxes map back"""
+        scale = MAX_IMAGE_SIZE[1] / 3840
+        stub = StubMTCNN(
+            box=[200 * scale, 400 * scale, 400 * scale, 800 * scale],
+            landmarks=[[x * scale, y * scale] for x, y in LANDMARKS],
+        )
+        image = np.zeros((3840, 2160, 3), dtype=np.uint8)
+
+        detections = make_detector(stub).detect_faces(image)
+
+        width, height = stub.seen_sizes[0]
+        assert height == MAX_IMAGE_SIZE[1]
+        assert width <= MAX_IMAGE_SIZE[0]
+
+        assert detections[0]['box'] == pytest.approx([200, 400, 400, 800], abs=1)
+        assert detections[0]['landmarks']['nose'] == pytest.approx([20, 30], abs=1e-3)
+
+    def test_small_image_not_resized(self):
+        """Test images inside MAX_IMAGE_SIZE are detected at full size"""
+        stub = StubMTCNN(box=[100, 200, 300, 400], landmarks=LANDMARKS)
+        image = np.zeros((480, 640, 3), dtype=np.uint8)
+
+        detections = make_detector(stub).detect_faces(image)
+
+        assert stub.seen_sizes[0] == (640, 480)
+        assert detections[0]['box'] == [100, 200, 300, 400]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,44 @@
+import pytest
+import numpy as np
+from scipy.spatial.distance import cosine
+
+import sys
+sys.path.insert(0, '..')
+from models.face_recognizer import EmbeddingAggregator
+
+
+def reference_stability(embeddings) -> float:
+    """Original nested-loop implementation of get_stability"""
+    recent = embeddings[-min(10, len(embeddings)):]
+    similarities = []
+    for i in range(len(recent)):
+        for j in range(i + 1, len(recent)):
+            similarities.append(1 - cosine(recent[i], recent[j]))
+    return np.mean(similarities) if similarities else 0.0
+
+
+class TestEmbeddingAggregatorStability:
+    """Tests that the vectorized stability matches the scipy pairwise loop"""
+
+    @pytest.mark.parametrize("count", [2, 5, 10, 15])
+    def test_matches_scipy_loop(self, count):
+        """Test get_stability equals the mean pairwise cosine of the last 10 embeddings"""
+        rng = np.random.default_rng(count)
+        base = rng.normal(size=512)
+
+        aggregator = EmbeddingAggregator()
+        for _ in range(count):
+            aggregator.add_embedding(base + rng.normal(scale=0.5, size=512))
+
+        expected = reference_stability(aggregator.embeddings)
+        assert aggregator.get_stability() == pytest.approx(expected, abs=1e-5)
+
+    def test_single_embedding_is_zero(self):
+        """Test stability needs at least two embeddings"""
+        aggregator = EmbeddingAggregator()
+        aggregator.add_embedding(np.ones(512))
+        assert aggregator.get_stability() == 0.0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,69 @@
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+import sys
+sys.path.insert(0, '..')
+from api.middleware import UploadSizeLimitMiddleware, FORM_OVERHEAD_BYTES
+
+MAX_BYTES = 1024
+LIMIT = MAX_BYTES + FORM_OVERHEAD_BYTES
+
+app = FastAPI()
+app.add_middleware(UploadSizeLimitMiddleware, max_bytes=MAX_BYTES)
+
+handled = []
+
+
+@app.post("/upload")
+async def upload(request: Request):
+    body = await request.body()
+    handled.append(len(body))
+    return {"size": len(body)}
+
+
+client = TestClient(app)
+
+
+def chunked(total: int, chunk_size: int = 4096):
+    """Yield total bytes in chunks so the request is sent without Content-Length"""
+    sent = 0
+    while sent < total:
+        size = min(chunk_size, total - sent)
+        sent += size
+        yield b"x" * size
+
+
+class TestUploadSizeLimit:
+    """Tests for the upload size limit middleware"""
+
+    def setup_method(self):
+        handled.clear()
+
+    def test_normal_upload_passes(self):
+        """Test a body under the limit reaches the route untouched"""
+        response = client.post("/upload", content=b"x" * MAX_BYTES)
+        assert response.status_code == 200
+        assert response.json() == {"size": MAX_BYTES}
+
+    def test_content_length_over_limit(self):
+        """Test a declared Content-Length over the limit is rejected before the route runs"""
+        response = client.post("/upload", content=b"x" * (LIMIT + 1))
+        assert response.status_code == 413
+        assert handled == []
+
+    def test_streamed_body_over_limit(self):
+        """Test a chunked body without Content-Length is cut off once it crosses the limit"""
+        response = client.post("/upload", content=chunked(LIMIT + 8192))
+        assert response.status_code == 413
+        assert handled == []
+
+    def test_malformed_content_length(self):
+        """Test a non-numeric Content-Length is rejected with 400"""
+        response = client.post("/upload", content=b"x", headers={"content-length": "abc"})
+        assert response.status_code == 400
+        assert handled == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
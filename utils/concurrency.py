@@ -0,0 +1,28 @@
+"""
+Shared worker pool for CPU-bound work
+
+Used by the API routes and the embedding batcher so decode, detection,
+embedding and FAS all draw from one bounded set of threads.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+import torch
+
+from config import APP_ENV, CPU_POOL_WORKERS
+
+# Worker threads for CPU-bound CV work (decode, detection, embedding, FAS)
+# so async handlers don't block the event loop
+CPU_POOL = ThreadPoolExecutor(max_workers=CPU_POOL_WORKERS)
+
+if APP_ENV == "prod":
+    # Parallelism comes from worker processes and CPU_POOL; letting torch also
+    # spawn cpu_count intra-op threads per call would oversubscribe the host
+    torch.set_num_threads(1)
+
+
+async def run_cpu_bound(func: Callable, *args) -> Any:
+    """Run a blocking call on CPU_POOL and await its result"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(CPU_POOL, func, *args)
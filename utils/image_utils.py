@@ -1,6 +1,6 @@
 import io
 import base64
-from typing import Tuple, Optional, List
+from typing import Tuple, Optional, List, BinaryIO
 import numpy as np
 from PIL import Image
 import cv2
@@ -15,6 +15,17 @@ def load_image_from_bytes(image_bytes: bytes) -> np.ndarray:
     return image
 
 
+def load_image_from_file(file_obj: BinaryIO) -> np.ndarray:
+    """
+    Load image from a file-like object (e.g. an UploadFile's spooled file)
+    
+    Decodes straight from the file buffer without an intermediate BytesIO copy.
+    """
+    file_obj.seek(0)
+    nparr = np.frombuffer(file_obj.read(), np.uint8)
+    return cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+
+
 def load_image_from_base64(base64_string: str) -> np.ndarray:
     """
     Load image from base64 string
@@ -47,18 +58,30 @@ def resize_image(image: np.ndarray, max_size: Tuple[int, int]) -> np.ndarray:
     """
     Resize image to fit within max_size while maintaining aspect ratio
     """
+    return fit_image(image, max_size)[0]
+
+
+def fit_image(image: np.ndarray, max_size: Tuple[int, int]) -> Tuple[np.ndarray, float]:
+    """
+    Downscale image to fit within max_size, keeping the aspect ratio
+    
+    Returns:
+        (image, scale) where scale <= 1.0; divide coordinates found on the
+        returned image by scale to map them back onto the original
+    """
     height, width = image.shape[:2]
     max_width, max_height = max_size
     
     if width <= max_width and height <= max_height:
-        return image
+        return image, 1.0
     
     # Calculate scaling factor
     scale = min(max_width / width, max_height / height)
     new_width = int(width * scale)
     new_height = int(height * scale)
     
-    return cv2.resize(image, (new_width, new_height), interpolation=cv2.INTER_AREA)
+    resized = cv2.resize(image, (new_width, new_height), interpolation=cv2.INTER_AREA)
+    return resized, scale
 
 
 def crop_face(image: np.ndarray, bbox: List[int], margin: float = 0.2) -> np.ndarray: